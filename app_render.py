@@ -1,166 +1,345 @@
 
+# Patch sockets before anything else imports them so upstream requests
+# yield to other /scrape calls under gunicorn's gevent worker
+try:
+    from gevent import monkey
+    monkey.patch_all()
+except ImportError:
+    pass
+
 import os
 from flask import Flask, render_template, request, jsonify, send_file
+from flask.json.provider import JSONProvider
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
+import pyarrow.compute as pc
+from itertools import chain
 import re
 import time
 import random
 from datetime import datetime
 import logging
+import threading
+from cachetools import TTLCache
 from urllib.parse import urlparse
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import tempfile
+import uuid
+
+class OrjsonProvider(JSONProvider):
+    """Route jsonify() and request.get_json() through orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 # Create Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Precompiled URL patterns (compiled once at import, reused per request)
+# One alternation classifies the URL in a single scan: group 1 is Google Play,
+# group 2 is the App Store
+_PLATFORM_RE = re.compile(r'(?:(play\.google\.com)|((?:apps|itunes)\.apple\.com))')
+_GP_ID_RE = re.compile(r'id=([^&]+)')
+_AS_ID_RE = re.compile(r'id(\d+)')
+# Export names as generated by /scrape; /status and /download serve nothing else
+_UNSAFE_NAME_CHARS_RE = re.compile(r'[^\w.]')
+_EXPORT_NAME_RE = re.compile(r'reviews_[\w.]{1,50}_\d{8}_\d{6}_[0-9a-f]{32}\.csv\.zst')
+
+# Column layout of the exported CSV; declared up front so Arrow never infers types.
+# review_date holds datetimes until _format_review_dates turns it into text.
+REVIEW_SCHEMA = pa.schema([
+    ('app_name', pa.string()),
+    ('reviewer_name', pa.string()),
+    ('rating', pa.int8()),
+    ('review_text', pa.string()),
+    ('review_date', pa.timestamp('s')),
+    ('helpful_count', pa.int32()),
+    ('platform', pa.dictionary(pa.int8(), pa.string())),
+])
+_REVIEW_DATE_IDX = REVIEW_SCHEMA.get_field_index('review_date')
+_CSV_SCHEMA = REVIEW_SCHEMA.set(_REVIEW_DATE_IDX, pa.field('review_date', pa.string()))
+REVIEW_BATCH_SIZE = 1000  # rows per column batch yielded by the scrapers
+REVIEW_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+GOOGLE_PLAY_PAGE_SIZE = 199  # most reviews google-play-scraper fetches per request
+
+# iTunes customer-reviews RSS feed: 50 reviews per page, pages 1-10 only
+APP_STORE_REVIEWS_URL = 'https://itunes.apple.com/{country}/rss/customerreviews/page={page}/id={app_id}/sortby=mostrecent/json'
+APP_STORE_LOOKUP_URL = 'https://itunes.apple.com/lookup'
+APP_STORE_PAGE_SIZE = 50
+APP_STORE_MAX_PAGES = 10
+APP_STORE_MAX_WORKERS = 5  # concurrent feed requests, kept low for Apple's rate limit
+
+DEMO_APP_NAME = 'Demo App ({})'
+# Fixed demo columns; _get_demo_data fills in app name, date and platform
+_DEMO_REVIEWS = {
+    'reviewer_name': ('Demo User 1', 'Demo User 2', 'Demo User 3'),
+    'rating': (5, 4, 5),
+    'review_text': (
+        'Great app! Works perfectly and has a beautiful interface.',
+        'Very useful app. The yellow theme looks amazing!',
+        'Excellent functionality and easy to use. Highly recommended!'
+    ),
+    'helpful_count': (15, 8, 22),
+}
+
+# Recent scrapes: (platform, app_id, max_reviews) -> (filename, review_count, app_name)
+_scrape_cache = TTLCache(maxsize=128, ttl=900)
+_scrape_cache_lock = threading.Lock()
+
+# Background scrape jobs. Their state lives in a <export>.status file next to
+# the export rather than in memory, so any gunicorn worker can answer /status
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+@lru_cache(maxsize=1024)
+def _cached_urlparse(u):
+    """urlparse memoized for URLs that get re-submitted (retries, refreshes)"""
+    return urlparse(u)
+
+def _format_review_dates(table):
+    """Format the review_date column in one vectorised pass instead of per-row strftime"""
+    dates = pc.strftime(table.column(_REVIEW_DATE_IDX), format=REVIEW_DATE_FORMAT)
+    return table.set_column(_REVIEW_DATE_IDX, 'review_date', dates)
+
+def _write_reviews_csv(batches, dest):
+    """Write column batches ({field: [values]}) to zstd-compressed CSV at dest
+    (a path or binary file object), returning the row count"""
+    review_count = 0
+    with pa.CompressedOutputStream(dest, 'zstd') as sink, \
+            pacsv.CSVWriter(sink, _CSV_SCHEMA) as writer:
+        for batch in batches:
+            table = pa.table(batch, schema=REVIEW_SCHEMA)
+            writer.write_table(_format_review_dates(table))
+            review_count += table.num_rows
+    return review_count
+
 class ReviewScraper:
     def __init__(self):
         self.session = requests.Session()
+        # Keep-alive pool sized for fan-out to the store CDNs, with light retries
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        try:
+            self._use_session_for_google_play()
+        except ImportError:
+            pass  # scrape_google_play_reviews falls back to demo data
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
 
     def detect_platform(self, url):
         """Detect if URL is from Google Play Store or Apple App Store"""
-        if 'play.google.com' in url:
-            return 'google_play'
-        elif 'apps.apple.com' in url or 'itunes.apple.com' in url:
-            return 'app_store'
-        else:
+        match = _PLATFORM_RE.search(url)
+        if not match:
             return None
+        return 'google_play' if match.group(1) else 'app_store'
 
     def extract_app_id(self, url, platform):
         """Extract app ID from URL"""
         if platform == 'google_play':
-            match = re.search(r'id=([^&]+)', url)
-            return match.group(1) if match else None
+            match = _GP_ID_RE.search(url)
         elif platform == 'app_store':
-            match = re.search(r'id(\d+)', url)
-            return match.group(1) if match else None
-        return None
-
-    def scrape_google_play_reviews(self, app_id, max_reviews=500):
-        """Scrape Google Play Store reviews"""
-        reviews = []
-
-        try:
-            # Try to import and use google-play-scraper
-            from google_play_scraper import app, Sort, reviews_all
-
-            # Get app info
-            app_info = app(app_id)
-            app_name = app_info['title']
-
-            # Get reviews with delays to avoid rate limiting
-            result = reviews_all(
+            match = _AS_ID_RE.search(url)
+        else:
+            return None
+        return match.group(1) if match else None
+
+    def _google_play_request(self, method, url, **kwargs):
+        """Issue a google-play-scraper request over the shared keep-alive session"""
+        from google_play_scraper.exceptions import ExtraHTTPError, NotFoundError
+
+        response = self.session.request(method, url, timeout=30, **kwargs)
+        # Mirror the library's own urllib error mapping
+        if response.status_code == 404:
+            raise NotFoundError("App not found(404).")
+        if response.status_code >= 400:
+            raise ExtraHTTPError(f"App not found. Status code {response.status_code} returned.")
+        return response.content.decode('utf-8')
+
+    def _use_session_for_google_play(self):
+        """Point google-play-scraper's urllib helpers at self.session.
+
+        Called once from __init__. Relies on the private layout of
+        google-play-scraper==1.2.6 (requirements_render.txt), where
+        features.app and features.reviews bind ``get``/``post`` via
+        ``from ...utils.request import``; re-check when bumping that pin.
+        """
+        import google_play_scraper.features.app as gp_app
+        import google_play_scraper.features.reviews as gp_reviews
+
+        gp_app.get = lambda url: self._google_play_request('GET', url)
+        gp_reviews.post = lambda url, data, headers: self._google_play_request(
+            'POST', url, data=data, headers=headers
+        )
+
+    def _fetch_google_play_reviews(self, app_id, max_reviews, stop):
+        """Page through Google Play reviews, stopping once max_reviews are collected
+        or the ``stop`` event is set"""
+        from google_play_scraper import Sort, reviews
+
+        result = []
+        token = None
+        while True:
+            page, token = reviews(
                 app_id,
-                sleep_milliseconds=2000,  # 2 second delay between requests
                 lang='en',
                 country='us',
                 sort=Sort.NEWEST,
+                count=min(GOOGLE_PLAY_PAGE_SIZE, max_reviews or GOOGLE_PLAY_PAGE_SIZE),
+                continuation_token=token,
             )
+            result += page
+            if token.token is None or (max_reviews and len(result) >= max_reviews):
+                break
+            # Get reviews with delays to avoid rate limiting (2 seconds between
+            # requests); wakes early if the caller has given up on this scrape
+            if stop.wait(2):
+                break
+        return result
+
+    def scrape_google_play_reviews(self, app_id, max_reviews=500):
+        """Scrape Google Play Store reviews, yielding column batches"""
+        try:
+            # Try to import and use google-play-scraper
+            from google_play_scraper import app
+
+            # Fetch app info and reviews concurrently; review pages are
+            # chained by continuation token so they stay sequential
+            stop = threading.Event()
+            pool = ThreadPoolExecutor(max_workers=2)
+            try:
+                app_info_future = pool.submit(app, app_id)
+                reviews_future = pool.submit(self._fetch_google_play_reviews, app_id, max_reviews, stop)
+                app_name = app_info_future.result()['title']
+                result = reviews_future.result()
+            finally:
+                # If app() failed, stop paging now rather than waiting for
+                # every remaining review page before falling back
+                stop.set()
+                pool.shutdown(wait=False, cancel_futures=True)
 
             # Limit reviews if specified
             if max_reviews and len(result) > max_reviews:
                 result = result[:max_reviews]
 
-            for review in result:
-                reviews.append({
-                    'app_name': app_name,
-                    'reviewer_name': review['userName'],
-                    'rating': review['score'],
-                    'review_text': review['content'],
-                    'review_date': review['at'].strftime('%Y-%m-%d %H:%M:%S'),
-                    'helpful_count': review['thumbsUpCount'],
-                    'platform': 'Google Play Store'
-                })
-
         except ImportError:
             logger.warning("google-play-scraper not available")
             # Return sample data for demo
-            reviews = self._get_demo_data('google_play', app_id)
+            yield self._get_demo_data('google_play', app_id)
+            return
         except Exception as e:
             logger.error(f"Error scraping Google Play reviews: {str(e)}")
-            reviews = self._get_demo_data('google_play', app_id)
+            yield self._get_demo_data('google_play', app_id)
+            return
+
+        for start in range(0, len(result), REVIEW_BATCH_SIZE):
+            batch = result[start:start + REVIEW_BATCH_SIZE]
+            yield {
+                'app_name': [app_name] * len(batch),
+                'reviewer_name': [review['userName'] for review in batch],
+                'rating': [review['score'] for review in batch],
+                'review_text': [review['content'] for review in batch],
+                'review_date': [review['at'] for review in batch],  # formatted in bulk by the CSV writer
+                'helpful_count': [review['thumbsUpCount'] for review in batch],
+                'platform': ['Google Play Store'] * len(batch)
+            }
 
-        return reviews
+    def _fetch_app_store_page(self, app_id, page):
+        """Fetch one page of App Store reviews from the iTunes RSS feed"""
+        response = self.session.get(
+            APP_STORE_REVIEWS_URL.format(country='us', page=page, app_id=app_id),
+            timeout=15
+        )
+        response.raise_for_status()
+        entries = response.json().get('feed', {}).get('entry', [])
+        if isinstance(entries, dict):
+            entries = [entries]  # single-entry feeds aren't wrapped in a list
+        # The first page may lead with an app metadata entry; keep reviews only
+        return [entry for entry in entries if 'im:rating' in entry]
+
+    def _fetch_app_store_name(self, app_id):
+        """Look up the App Store app name via the iTunes lookup API"""
+        response = self.session.get(APP_STORE_LOOKUP_URL, params={'id': app_id, 'country': 'us'}, timeout=15)
+        response.raise_for_status()
+        results = response.json().get('results')
+        return results[0].get('trackName') if results else None
 
     def scrape_app_store_reviews(self, app_id, max_reviews=500):
-        """Scrape Apple App Store reviews"""
-        reviews = []
+        """Scrape Apple App Store reviews, yielding column batches"""
+        max_reviews = max_reviews or 500
+        pages = min(APP_STORE_MAX_PAGES, -(-max_reviews // APP_STORE_PAGE_SIZE))
 
         try:
-            from app_store_scraper import AppStore
-
-            # Initialize scraper
-            scraper = AppStore(country='us', app_id=app_id)
-            scraper.review(how_many=max_reviews or 500)
-
-            app_name = scraper.app_name or f"App ID {app_id}"
+            # Feed pages are independently addressable, so fetch them all at
+            # once over the shared session alongside the app name lookup
+            with ThreadPoolExecutor(max_workers=APP_STORE_MAX_WORKERS) as pool:
+                app_name_future = pool.submit(self._fetch_app_store_name, app_id)
+                page_futures = [
+                    pool.submit(self._fetch_app_store_page, app_id, page)
+                    for page in range(1, pages + 1)
+                ]
+                app_name = app_name_future.result() or f"App ID {app_id}"
+                result = [entry for future in page_futures for entry in future.result()]
+
+            result = result[:max_reviews]
 
-            for review in scraper.reviews:
-                reviews.append({
-                    'app_name': app_name,
-                    'reviewer_name': review['userName'],
-                    'rating': review['rating'],
-                    'review_text': review['review'],
-                    'review_date': review['date'].strftime('%Y-%m-%d %H:%M:%S') if review['date'] else '',
-                    'helpful_count': 0,  # App Store doesn't provide this
-                    'platform': 'Apple App Store'
-                })
-
-        except ImportError:
-            logger.warning("app-store-scraper not available")
-            reviews = self._get_demo_data('app_store', app_id)
         except Exception as e:
             logger.error(f"Error scraping App Store reviews: {str(e)}")
-            reviews = self._get_demo_data('app_store', app_id)
-
-        return reviews
+            yield self._get_demo_data('app_store', app_id)
+            return
+
+        for start in range(0, len(result), REVIEW_BATCH_SIZE):
+            batch = result[start:start + REVIEW_BATCH_SIZE]
+            yield {
+                'app_name': [app_name] * len(batch),
+                'reviewer_name': [entry['author']['name']['label'] for entry in batch],
+                'rating': [int(entry['im:rating']['label']) for entry in batch],
+                'review_text': [entry['content']['label'] for entry in batch],
+                # formatted in bulk by the CSV writer
+                'review_date': [datetime.fromisoformat(entry['updated']['label']) for entry in batch],
+                'helpful_count': [int(entry.get('im:voteSum', {}).get('label', 0)) for entry in batch],
+                'platform': ['Apple App Store'] * len(batch)
+            }
 
     def _get_demo_data(self, platform, app_id):
         """Generate demo data when scraping libraries aren't available"""
         platform_name = 'Google Play Store' if platform == 'google_play' else 'Apple App Store'
-        demo_reviews = [
-            {
-                'app_name': f'Demo App ({app_id})',
-                'reviewer_name': 'Demo User 1',
-                'rating': 5,
-                'review_text': 'Great app! Works perfectly and has a beautiful interface.',
-                'review_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'helpful_count': 15,
-                'platform': platform_name
-            },
-            {
-                'app_name': f'Demo App ({app_id})',
-                'reviewer_name': 'Demo User 2',
-                'rating': 4,
-                'review_text': 'Very useful app. The yellow theme looks amazing!',
-                'review_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'helpful_count': 8,
-                'platform': platform_name
-            },
-            {
-                'app_name': f'Demo App ({app_id})',
-                'reviewer_name': 'Demo User 3',
-                'rating': 5,
-                'review_text': 'Excellent functionality and easy to use. Highly recommended!',
-                'review_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'helpful_count': 22,
-                'platform': platform_name
-            }
-        ]
+        row_count = len(_DEMO_REVIEWS['rating'])
+        demo_reviews = {
+            **_DEMO_REVIEWS,
+            'app_name': [DEMO_APP_NAME.format(app_id)] * row_count,
+            'review_date': [datetime.now()] * row_count,
+            'platform': [platform_name] * row_count
+        }
         return demo_reviews
 
-    def scrape_reviews(self, url, max_reviews=500):
-        """Main method to scrape reviews from either platform"""
+    def resolve_app(self, url):
+        """Return (platform, app_id) for a store URL, raising ValueError if unsupported"""
         platform = self.detect_platform(url)
 
         if not platform:
@@ -170,6 +349,12 @@ class ReviewScraper:
         if not app_id:
             raise ValueError("Could not extract app ID from URL.")
 
+        return platform, app_id
+
+    def scrape_reviews(self, url, max_reviews=500):
+        """Main method to scrape reviews from either platform (column batches are yielded lazily)"""
+        platform, app_id = self.resolve_app(url)
+
         if platform == 'google_play':
             reviews = self.scrape_google_play_reviews(app_id, max_reviews)
         else:
@@ -180,6 +365,44 @@ class ReviewScraper:
 # Global scraper instance
 scraper = ReviewScraper()
 
+def _write_job_status(filepath, **status):
+    """Atomically record a scrape job's state in filepath + '.status'"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath))
+    with os.fdopen(fd, 'wb') as f:
+        f.write(orjson.dumps(status))
+    os.replace(tmp_path, filepath + '.status')
+
+def _do_scrape_and_write(url, max_reviews, filepath, cache_key):
+    """Run one scrape to completion on the executor, recording the outcome on disk"""
+    # Write under a unique temporary name so /download never serves a partial file
+    fd, part_path = tempfile.mkstemp(dir=os.path.dirname(filepath), suffix='.part')
+    try:
+        # Own the descriptor straight away so every failure path closes it
+        with os.fdopen(fd, 'wb') as f:
+            batches = scraper.scrape_reviews(url, max_reviews)
+            first_batch = next(batches, None)
+
+            if first_batch is None:
+                raise LookupError('No reviews found or unable to scrape')
+
+            # Stream batches to CSV as the scraper yields them
+            review_count = _write_reviews_csv(chain([first_batch], batches), f)
+        os.replace(part_path, filepath)
+    except Exception as e:
+        logger.error(f"Error in background scrape for {url}: {str(e)}")
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        _write_job_status(filepath, status='error', error=str(e))
+        return
+
+    scraped_app_name = first_batch['app_name'][0]
+    _write_job_status(filepath, status='done', review_count=review_count, app_name=scraped_app_name)
+
+    # Don't pin demo fallback data in the cache
+    if scraped_app_name != DEMO_APP_NAME.format(cache_key[1]):
+        with _scrape_cache_lock:
+            _scrape_cache[cache_key] = (os.path.basename(filepath), review_count, scraped_app_name)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -200,51 +423,100 @@ def scrape():
 
         # Validate URL
         try:
-            parsed = urlparse(url)
+            parsed = _cached_urlparse(url)
             if not parsed.scheme or not parsed.netloc:
                 return jsonify({'error': 'Invalid URL format'}), 400
         except Exception:
             return jsonify({'error': 'Invalid URL format'}), 400
 
-        # Scrape reviews
-        reviews = scraper.scrape_reviews(url, max_reviews)
-
-        if not reviews:
-            return jsonify({'error': 'No reviews found or unable to scrape'}), 404
-
-        # Generate unique filename
+        # Normalise before it becomes part of the cache key ("500" == 500);
+        # 0/null keep meaning "no limit"
+        if max_reviews is not None:
+            try:
+                max_reviews = int(max_reviews)
+            except (TypeError, ValueError):
+                return jsonify({'error': 'max_reviews must be an integer'}), 400
+            if max_reviews < 0:
+                return jsonify({'error': 'max_reviews must not be negative'}), 400
+
+        # Reuse a recent export of the same app if its file is still on disk
+        platform, app_id = scraper.resolve_app(url)
+        cache_key = (platform, app_id, max_reviews)
+        with _scrape_cache_lock:
+            cached = _scrape_cache.get(cache_key)
+        if cached and os.path.exists(os.path.join('/tmp', cached[0])):
+            filename, review_count, scraped_app_name = cached
+            return jsonify({
+                'success': True,
+                'status': 'done',
+                'message': f'Successfully scraped {review_count} reviews',
+                'filename': filename,
+                'review_count': review_count,
+                'app_name': scraped_app_name
+            })
+
+        # Generate unique filename (the uuid keeps concurrent jobs, possibly on
+        # different workers, from sharing a file)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        app_name = reviews[0]['app_name'].replace(' ', '_').replace('/', '_')[:50]  # Limit length
-        filename = f"reviews_{app_name}_{timestamp}.csv"
-
-        # Create CSV in temporary directory (Render-compatible)
-        df = pd.DataFrame(reviews)
+        app_name = _UNSAFE_NAME_CHARS_RE.sub('_', app_id)[:50]  # Limit length
+        filename = f"reviews_{app_name}_{timestamp}_{uuid.uuid4().hex}.csv.zst"
 
         # Use Render's temporary storage
         temp_dir = '/tmp'  # Render's temporary directory
         filepath = os.path.join(temp_dir, filename)
-        df.to_csv(filepath, index=False, encoding='utf-8')
+
+        # Scrape and write in the background; clients poll /status/<filename>.
+        # The status file exists before the job starts so no poll can miss it.
+        _write_job_status(filepath, status='running')
+        _EXECUTOR.submit(_do_scrape_and_write, url, max_reviews, filepath, cache_key)
 
         return jsonify({
             'success': True,
-            'message': f'Successfully scraped {len(reviews)} reviews',
+            'status': 'running',
+            'message': 'Scrape started',
             'filename': filename,
-            'review_count': len(reviews),
-            'app_name': reviews[0]['app_name']
-        })
+            'status_url': f'/status/{filename}'
+        }), 202
 
     except Exception as e:
         logger.error(f"Error in scrape endpoint: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/status/<filename>')
+def scrape_status(filename):
+    if not _EXPORT_NAME_RE.fullmatch(filename):
+        return jsonify({'error': 'Unknown scrape job'}), 404
+
+    try:
+        with open(os.path.join('/tmp', filename + '.status'), 'rb') as f:
+            job = orjson.loads(f.read())
+    except FileNotFoundError:
+        return jsonify({'error': 'Unknown scrape job'}), 404
+
+    job['filename'] = filename
+    if job['status'] == 'done':
+        job['message'] = f"Successfully scraped {job['review_count']} reviews"
+    return jsonify(job)
+
 @app.route('/download/<filename>')
 def download_file(filename):
+    if not _EXPORT_NAME_RE.fullmatch(filename):
+        return jsonify({'error': 'File not found. Please scrape reviews first.'}), 404
+
     try:
         # Use Render's temporary directory
         filepath = os.path.join('/tmp', filename)
 
         if os.path.exists(filepath):
-            return send_file(filepath, as_attachment=True, download_name=filename)
+            # Passing the path lets the server hand the file to wsgi.file_wrapper
+            # (sendfile under gunicorn) and answer conditional/range requests
+            return send_file(
+                filepath,
+                mimetype='application/zstd',
+                as_attachment=True,
+                download_name=filename,
+                conditional=True
+            )
         else:
             return jsonify({'error': 'File not found. Please scrape reviews first.'}), 404
     except Exception as e: